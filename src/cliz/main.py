@@ -1,40 +1,76 @@
 import argparse
+import json
 import logging
 import os
 import platform
+import shutil
+import tempfile
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from textwrap import dedent
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 import uuid
 
-import yaml
-from agno.agent import Agent
-from agno.exceptions import StopAgentRun
-from agno.models.openai.like import OpenAILike
-from agno.storage.sqlite import SqliteStorage
-from agno.tools import FunctionCall, tool
-from agno.tools.thinking import ThinkingTools
-from rich.console import Console
-from rich.prompt import Prompt
-
 from . import __version__
-from .shell import ShellToolkit
+from .shell import ShellToolkit, run_parallel
+
+# Heavy dependencies (agno, rich, yaml) are imported where they are used,
+# so that `--help` and `--version` return without loading them.
+if TYPE_CHECKING:
+    from agno.storage.sqlite import SqliteStorage
+    from agno.tools import FunctionCall
+    from rich.console import Console
+    from rich.live import Live
 
 # Configure logging
 logger = logging.getLogger("cliz")
 
-# Configuration constants
-CLIZ_HOME_PATH = Path.home() / ".cliz"
-CONFIG_FILE_PATH = CLIZ_HOME_PATH / "cliz.yaml"
-DB_FILE_PATH = CLIZ_HOME_PATH / "cliz.db"
+# Configuration constants as paths relative to the home directory, resolved
+# lazily by cliz_path so that `--help` and `--version` never look it up
+CLIZ_PATHS = {
+    "CLIZ_HOME_PATH": ".cliz",
+    "CONFIG_FILE_PATH": ".cliz/cliz.yaml",
+    "DB_FILE_PATH": ".cliz/cliz.db",
+}
+
+# Applied to every SQLite connection of the chat history storage
+SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "cache_size=-65536",
+    "busy_timeout=5000",
+)
+
+# Lines of help text kept per tool when prefetching help into the prompt
+PREFETCH_HELP_LINES = 40
 
 # Global state
-console = Console()
+console: Optional["Console"] = None
+shell_toolkit = ShellToolkit()
 auto_mode = False
 response_language = "English"
 
 
+def cliz_path(name: str) -> Path:
+    """Resolve one of the CLIZ_PATHS configuration paths.
+    
+    Args:
+        name: The constant name, e.g. "CONFIG_FILE_PATH"
+        
+    Returns:
+        Path: The resolved path
+    """
+    return Path.home() / CLIZ_PATHS[name]
+
+
+def __getattr__(name: str) -> Path:
+    """Resolve the configuration path constants on first access (PEP 562)."""
+    if name in CLIZ_PATHS:
+        return cliz_path(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 class ConfigurationError(Exception):
     """Exception raised for configuration file errors."""
     pass
@@ -53,46 +89,212 @@ def load_config(path: Optional[str] = None) -> Dict[str, Any]:
         ConfigurationError: If the configuration file cannot be found or read
     """
     # Use specified path if provided
-    config_path = Path(path) if path else CONFIG_FILE_PATH
+    config_path = Path(path) if path else cliz_path("CONFIG_FILE_PATH")
+    
+    # A single stat both checks existence and gives the key for the cache
+    try:
+        config_stat = config_path.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        raise ConfigurationError(f"No config file found, see https://github.com/xgzlucario/cliz#Install") from None
+    
+    # Only the default config gets a JSON cache, `-c` paths are left untouched
+    use_cache = not path
+    cache_path = config_path.with_name(config_path.name + ".json")
+    cache_key = [config_stat.st_mtime_ns, config_stat.st_size]
+    
+    if use_cache:
+        config = read_config_cache(cache_path, cache_key)
+        if config is not None:
+            return config
+    
+    import yaml
+
+    # Prefer the libyaml-backed loader, fall back to the pure-Python one
+    Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    
+    # Read as bytes so libyaml can skip the Python-level decode
+    with open(config_path, 'rb') as config_file:
+        config = yaml.load(config_file, Loader=Loader)
+    
+    # JSON would turn non-string keys into strings, keep those uncached
+    if use_cache and has_only_str_keys(config):
+        write_config_cache(cache_path, cache_key, config)
+    return config
+
+
+def has_only_str_keys(value: Any) -> bool:
+    """Check that every mapping in a parsed YAML value has string keys.
+    
+    Args:
+        value: The parsed YAML value
+        
+    Returns:
+        bool: True if the value survives a JSON round trip with the same keys
+    """
+    if isinstance(value, dict):
+        return all(isinstance(k, str) and has_only_str_keys(v) for k, v in value.items())
+    if isinstance(value, list):
+        return all(has_only_str_keys(v) for v in value)
+    return True
+
+
+def read_config_cache(cache_path: Path, cache_key: List[int]) -> Optional[Dict[str, Any]]:
+    """Read the JSON config cache if it was written for the current YAML file.
     
-    if not config_path.exists():
-        raise ConfigurationError(f"No config file found, see https://github.com/xgzlucario/cliz#Install")
+    Args:
+        cache_path: Path to the JSON cache file
+        cache_key: The YAML file's [st_mtime_ns, st_size]
+        
+    Returns:
+        Optional[Dict[str, Any]]: The cached configuration, or None if the
+        cache is missing, unreadable or stale
+    """
+    try:
+        with open(cache_path, 'rb') as cache_file:
+            cache = json.load(cache_file)
+    except (OSError, ValueError):
+        return None
+    
+    # Any change to the YAML file, even to an older mtime, invalidates the cache
+    if not isinstance(cache, dict) or cache.get("key") != cache_key:
+        return None
+    return cache.get("config")
+
+
+def write_config_cache(cache_path: Path, cache_key: List[int], config: Any) -> None:
+    """Atomically write the parsed configuration to a JSON cache file.
+    
+    Failures are ignored, the YAML file will simply be parsed again next time.
+    
+    Args:
+        cache_path: Path to the JSON cache file
+        cache_key: The YAML file's [st_mtime_ns, st_size]
+        config: The parsed configuration
+    """
+    # mkstemp gives a unique name, so concurrent runs never share a temp
+    # file, and mode 0600, so the cached api_key is not readable by others
+    try:
+        fd, tmp_name = tempfile.mkstemp(dir=cache_path.parent, prefix=cache_path.name, suffix=".tmp")
+    except OSError as e:
+        logger.debug(f"Failed to write config cache: {e}")
+        return
     
-    # Open the file and pass its contents to yaml.safe_load
-    with open(config_path, 'r') as config_file:
-        return yaml.safe_load(config_file)
+    try:
+        with os.fdopen(fd, 'w') as tmp_file:
+            json.dump({"key": cache_key, "config": config}, tmp_file)
+        os.replace(tmp_name, cache_path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug(f"Failed to write config cache: {e}")
+        Path(tmp_name).unlink(missing_ok=True)
+    
+
+def create_storage(db_file: Path) -> "SqliteStorage":
+    """Create the chat history storage on a WAL-mode SQLite database.
+    
+    Args:
+        db_file: Path to the SQLite database file
+        
+    Returns:
+        SqliteStorage: The storage for agent sessions
+    """
+    from agno.storage.sqlite import SqliteStorage
+    from sqlalchemy import event
+    
+    # SqliteStorage ignores a passed db_engine, so hook into the one it creates
+    storage = SqliteStorage(table_name="agent_sessions", db_file=db_file)
     
+    @event.listens_for(storage.db_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(f"PRAGMA {pragma}")
+        cursor.close()
+    
+    # Drop any connection opened before the listener was registered
+    storage.db_engine.dispose()
+    return storage
+
 
-def confirm_command_execution(fc: FunctionCall):
+def optimize_storage(storage: "SqliteStorage"):
+    """Run `PRAGMA optimize` once before the process exits.
+    
+    Args:
+        storage: The storage created by create_storage
+    """
+    try:
+        with storage.db_engine.connect() as connection:
+            connection.exec_driver_sql("PRAGMA optimize")
+    except Exception as e:
+        logger.debug(f"Failed to optimize storage: {e}")
+
+
+def get_live_display() -> Optional["Live"]:
+    """Return the live display currently attached to the console, if any.
+    
+    Rich has no public accessor for it: releases before 14.1 keep a single
+    `_live`, later ones a `_live_stack`.
+    
+    Returns:
+        Optional[Live]: The innermost active live display
+    """
+    live_display = getattr(console, "_live", None)
+    if live_display is None:
+        live_stack = getattr(console, "_live_stack", None)
+        live_display = live_stack[-1] if live_stack else None
+    return live_display
+
+
+def confirm_command_execution(fc: "FunctionCall"):
     """Request user confirmation before executing a command.
     
     Args:
         fc: The function call to confirm
         
     Raises:
-        StopAgentRun: If the user does not confirm the execution
+        StopAgentRun: If the user does not confirm the execution or cannot be asked
     """
     if auto_mode:
         return
     
-    # Pause any live display
-    live_display = console._live
-    live_display.stop()
-
-    args = fc.arguments
-    tool_name = fc.function.name
-    full_command = f"{args['command']} {args['args']}"
+    from agno.exceptions import StopAgentRun
+    from rich.prompt import Prompt
     
-    # Ask for confirmation
-    console.print(f"About to run {tool_name}: [bold blue]{full_command}[/]")
-    response = (
-        Prompt.ask("Do you want to continue?", choices=["y", "n"], default="y")
-        .strip()
-        .lower()
-    )
-
-    # Resume live display
-    live_display.start()
+    # Pause any live display while waiting for the user
+    live_display = get_live_display()
+    if live_display is not None:
+        live_display.stop()
+    
+    try:
+        args = fc.arguments
+        tool_name = fc.function.name
+        
+        # run_shell_commands_parallel passes a batch, the other tools a single command
+        if "commands" in args:
+            commands = args["commands"] or []
+            if not commands:
+                return
+        else:
+            commands = [args]
+        full_command = "\n".join(f"{c['command']} {c.get('args', '')}" for c in commands)
+        
+        # Ask for confirmation
+        console.print(f"About to run {tool_name}: [bold blue]{full_command}[/]")
+        response = (
+            Prompt.ask("Do you want to continue?", choices=["y", "n"], default="y", console=console)
+            .strip()
+            .lower()
+        )
+    except Exception as e:
+        # agno runs the tool anyway if a pre-hook raises anything else,
+        # so a broken or unanswered prompt must cancel the command
+        raise StopAgentRun(
+            f"Command confirmation failed: {e!r}",
+            agent_message="Execution stopped as permission could not be obtained.",
+        ) from e
+    finally:
+        # Resume live display
+        if live_display is not None:
+            live_display.start()
 
     # If the user does not confirm, stop execution
     if response != "y":
@@ -102,7 +304,6 @@ def confirm_command_execution(fc: FunctionCall):
         )
 
 
-@tool
 def get_tool_help(command: str, sub_command: Optional[str] = None, help_arg: str = "-h") -> str:
     """Get help information for a command-line tool.
 
@@ -114,10 +315,59 @@ def get_tool_help(command: str, sub_command: Optional[str] = None, help_arg: str
     Returns:
         str: The help text or error message
     """
-    return ShellToolkit().help(command, sub_command, help_arg)
+    # Don't cache "not found", the agent may install the tool and ask again
+    if shutil.which(command) is None:
+        return shell_toolkit.help(command, sub_command, help_arg)
+    return cached_tool_help(command, sub_command, help_arg)
+
+
+@lru_cache(maxsize=256)
+def cached_tool_help(command: str, sub_command: Optional[str], help_arg: str) -> str:
+    """Memoized help lookup, help output does not change within a session."""
+    return shell_toolkit.help(command, sub_command, help_arg)
+
+
+def head_of_help(help_text: str) -> str:
+    """Keep the first PREFETCH_HELP_LINES lines of a help text.
+    
+    Usage and the main options come first in help output, so unlike
+    ShellToolkit.truncate_output this keeps the head.
+    
+    Args:
+        help_text: The full help text
+        
+    Returns:
+        str: The possibly truncated help text with notification
+    """
+    lines = help_text.splitlines(keepends=True)
+    if len(lines) <= PREFETCH_HELP_LINES:
+        return help_text
+    
+    nums_truncated = len(lines) - PREFETCH_HELP_LINES
+    return ''.join(lines[:PREFETCH_HELP_LINES]) + f"...(truncated {nums_truncated} lines)...\n"
+
+
+def prefetch_tool_help(names: List[str]) -> str:
+    """Fetch help text for the configured tools in parallel.
+    
+    The results also warm the get_tool_help cache. Each tool's help is cut
+    down to PREFETCH_HELP_LINES lines to keep the prompt small.
+    
+    Args:
+        names: Names of the configured tools
+        
+    Returns:
+        str: A prompt section with the help text of every tool
+    """
+    if not names:
+        return ""
+    
+    helps = run_parallel(get_tool_help, names)
+    sections = [f"### {name}\n{head_of_help(help_text)}" for name, help_text in zip(names, helps)]
+    
+    return "\n## 工具帮助信息\n" + "\n".join(sections)
 
 
-@tool(pre_hook=confirm_command_execution)
 def run_shell_command(command: str, args: str, work_dir: str = ".") -> str:
     """Run a shell command with the given arguments.
 
@@ -129,10 +379,9 @@ def run_shell_command(command: str, args: str, work_dir: str = ".") -> str:
     Returns:
         str: The command output
     """     
-    return ShellToolkit().run(command, args, work_dir)
+    return shell_toolkit.run(command, args, work_dir)
 
 
-@tool(pre_hook=confirm_command_execution)
 def run_shell_command_background(command: str, args: str, work_dir: str = ".") -> dict:
     """Run a shell command with the given arguments in the background.
 
@@ -144,7 +393,34 @@ def run_shell_command_background(command: str, args: str, work_dir: str = ".") -
     Returns:
         dict: Process status information
     """
-    return ShellToolkit().run_background(command, args, work_dir)
+    return shell_toolkit.run_background(command, args, work_dir)
+
+
+def run_shell_commands_parallel(commands: List[Dict[str, str]]) -> str:
+    """Run several independent shell commands in parallel.
+
+    Args:
+        commands: Commands to run, each with "command", "args" and an optional "work_dir"
+
+    Returns:
+        str: The output of each command under a "$ command args" header, in the same order
+    """
+    specs = [(c["command"], c.get("args", ""), c.get("work_dir", ".")) for c in commands]
+    outputs = shell_toolkit.run_batch(specs)
+    return "\n".join(
+        f"$ {command} {args}\n{output}"
+        for (command, args, _), output in zip(specs, outputs)
+    )
+
+
+# Functions exposed to the agent as tools, and whether each one needs
+# user confirmation before it runs
+AGENT_TOOLS = (
+    (get_tool_help, False),
+    (run_shell_command, True),
+    (run_shell_command_background, True),
+    (run_shell_commands_parallel, True),
+)
 
 
 SYSTEM_PROMPT = """
@@ -159,13 +435,15 @@ SYSTEM_PROMPT = """
 1. get_tool_help - 获取命令行工具的帮助信息
 2. run_shell_command - 运行命令行命令
 3. run_shell_command_background - 在后台运行命令行命令
+4. run_shell_commands_parallel - 并行运行多个命令行命令
 
 遵循这些工具使用规则:
-1. 始终使用提供的工具与命令行交互，特别是 get_tool_help、run_shell_command 和 run_shell_command_background。
+1. 始终使用提供的工具与命令行交互，特别是 get_tool_help、run_shell_command、run_shell_command_background 和 run_shell_commands_parallel。
 2. 在使用工具之前, 先评估哪个工具最适合当前任务。
 3. 尽量组合使用工具来高效完成任务。
 4. 对于需要后台挂起或长时间运行的命令, 优先考虑使用 run_shell_command_background。
-5. **永远不要在与用户交流时直接提及工具名称**。例如，不要说 "我将使用 run_shell_command 工具", 而是直接说 "我将运行这个命令"。
+5. 对于多个互不依赖的命令, 优先考虑使用 run_shell_commands_parallel 一次性并行运行。
+6. **永远不要在与用户交流时直接提及工具名称**。例如，不要说 "我将使用 run_shell_command 工具", 而是直接说 "我将运行这个命令"。
 
 ## 推理和规划
 在执行任务前，你应该：
@@ -194,6 +472,7 @@ SYSTEM_PROMPT = """
 
 ## 推荐命令行工具
 {tools}
+{tool_help}
 
 用{language}回应。
 """
@@ -201,7 +480,7 @@ SYSTEM_PROMPT = """
 
 def main():
     """Main entry point for the cliz application."""
-    global auto_mode, response_language
+    global console, auto_mode, response_language
     
     # 1. Parse command line arguments
     parser = argparse.ArgumentParser(
@@ -235,6 +514,14 @@ def main():
     )
     args = parser.parse_args()
     
+    from agno.agent import Agent
+    from agno.models.openai.like import OpenAILike
+    from agno.tools import tool
+    from agno.tools.thinking import ThinkingTools
+    from rich.console import Console
+    
+    console = Console()
+    
     # 2. Load configuration
     try:
         config = load_config(path=args.config)
@@ -243,6 +530,7 @@ def main():
         response_language = config.get("respond_language", "English")
         auto_mode = config.get("auto", False) or args.auto
         chat_history = config.get("chat_history", False)
+        prefetch_help = config.get("prefetch_help", False)
            
         # Initialize LLM model
         model_config = config.get("llm")
@@ -263,29 +551,34 @@ def main():
         return 1
     
     # 3. Set up the agent
+    tools = config.get("tools") or []
+    tool_names = [t["name"] for t in tools if isinstance(t, dict) and "name" in t]
+    tool_help = prefetch_tool_help(tool_names) if prefetch_help else ""
+    
     system_prompt = SYSTEM_PROMPT.format(
-        tools=config.get("tools"),
+        tools=json.dumps(tools, ensure_ascii=False, separators=(",", ":"), default=str),
+        tool_help=tool_help,
         uname=platform.uname(),
         work_dir=os.getcwd(),
         datetime=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         language=response_language,
     )
     
+    storage = create_storage(cliz_path("DB_FILE_PATH"))
+    
     agent = Agent(
         model=model,
-        instructions=dedent(system_prompt),
+        instructions=system_prompt,
         tools=[
-            get_tool_help,
-            run_shell_command,
-            run_shell_command_background,
-            ThinkingTools()
-        ],
+            tool(pre_hook=confirm_command_execution if confirm else None)(func)
+            for func, confirm in AGENT_TOOLS
+        ] + [ThinkingTools()],
         show_tool_calls=True,
         markdown=True,
         debug_mode=args.debug,
         # Chat history configuration
         session_id=str(uuid.uuid4()),
-        storage=SqliteStorage(table_name="agent_sessions", db_file=DB_FILE_PATH),
+        storage=storage,
         add_history_to_messages=chat_history,
         num_history_runs=3,
     )
@@ -303,6 +596,8 @@ def main():
     except Exception as e:
         logger.error(f"Error during agent execution: {e}")
         return 1
+    finally:
+        optimize_storage(storage)
 
 
 if __name__ == "__main__":
@@ -1,6 +1,45 @@
+import shlex
+import shutil
 import subprocess
 import tempfile
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple
+
+# Characters that only a real shell can interpret (pipes, redirects, globs, ...)
+SHELL_METACHARACTERS = frozenset("|&;<>()$`*?[]{}~#\n")
+
+# Shell builtins, many also ship as binaries in /usr/bin that behave
+# differently (e.g. dash's echo expands backslash escapes), so these
+# always go through the shell
+SHELL_BUILTINS = frozenset({
+    ".", ":", "[", "alias", "bg", "break", "cd", "command", "continue",
+    "echo", "eval", "exec", "exit", "export", "false", "fg", "getopts",
+    "hash", "jobs", "kill", "newgrp", "printf", "pwd", "read", "readonly",
+    "return", "set", "shift", "test", "times", "trap", "true", "type",
+    "ulimit", "umask", "unalias", "unset", "wait",
+})
+
+# Upper bound on commands running at the same time
+MAX_PARALLEL_COMMANDS = 8
+
+
+def run_parallel(func: Callable[[Any], str], items: List[Any]) -> List[str]:
+    """Call a subprocess-bound function on every item concurrently.
+    
+    Each worker just blocks on a subprocess, so threads are enough.
+    
+    Args:
+        func: The function to call for each item
+        items: The items to process
+        
+    Returns:
+        List[str]: The results, in the same order as the items.
+    """
+    if not items:
+        return []
+    
+    with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_COMMANDS, len(items))) as executor:
+        return list(executor.map(func, items))
 
 
 class ShellToolkit:
@@ -10,6 +49,9 @@ class ShellToolkit:
     help commands, and formatting.
     """
     
+    # Stateless, so instances carry no per-instance __dict__
+    __slots__ = ()
+    
     def help(self, command: str, sub_command: Optional[str] = None, help_arg: str = "-h") -> str:
         """Get help information for this tool.
         
@@ -42,13 +84,37 @@ class ShellToolkit:
             nums_truncated = len(lines) - tail_lines
             lines = lines[-tail_lines:]
             
-            output = f'''...(truncated {nums_truncated} lines)...
-            {lines}
-            '''
-            
-            return output.strip()
+            return f"...(truncated {nums_truncated} lines)...\n" + ''.join(lines)
 
     
+    def split_command(self, full_command: str) -> Optional[List[str]]:
+        """Split a command line into an argv list when no shell is needed.
+        
+        Args:
+            full_command: The full command line
+            
+        Returns:
+            Optional[List[str]]: The argv list, or None if the command line
+            uses shell syntax, cannot be tokenized, names a shell builtin, or
+            is not a plain executable on PATH.
+        """
+        if any(c in SHELL_METACHARACTERS for c in full_command):
+            return None
+        
+        try:
+            argv = shlex.split(full_command)
+        except ValueError:
+            return None
+        
+        if not argv or argv[0] in SHELL_BUILTINS:
+            return None
+        
+        # Paths resolve against work_dir, leave those and unknown commands to the shell
+        if "/" in argv[0] or shutil.which(argv[0]) is None:
+            return None
+        
+        return argv
+    
     def run(self, command: str, args: str, work_dir: str = ".") -> str:
         """Run a shell command with the given arguments.
         
@@ -61,11 +127,13 @@ class ShellToolkit:
             str: The output of the command.
         """
         full_command = f"{command} {args}"
+        argv = self.split_command(full_command)
 
         try:
+            # Only go through /bin/sh when the command line needs it
             process = subprocess.run(
-                full_command,
-                shell=True,
+                argv or full_command,
+                shell=argv is None,
                 text=True,
                 capture_output=True,
                 cwd=work_dir
@@ -80,6 +148,17 @@ class ShellToolkit:
             return f"Error: {str(e)}"
         
     
+    def run_batch(self, commands: List[Tuple[str, str, str]]) -> List[str]:
+        """Run several shell commands concurrently and wait for all of them.
+        
+        Args:
+            commands: (command, args, work_dir) tuples to execute
+            
+        Returns:
+            List[str]: The output of each command, in the same order.
+        """
+        return run_parallel(lambda c: self.run(*c), commands)
+    
     def run_background(self, command: str, args: str, work_dir: str = ".") -> dict:
         """Run a shell command with the given arguments in the background.
         
@@ -92,28 +171,24 @@ class ShellToolkit:
             dict: Process information including the path to output file.
         """
         full_command = f"{command} {args}"
+        argv = self.split_command(full_command)
         
         try:
-            # create a temp file
-            temp_file = tempfile.NamedTemporaryFile(delete=False, mode='w+', suffix='.log')
-            temp_file_path = temp_file.name
-            temp_file.close()
-            
-            # redirect output to the temp file
-            with open(temp_file_path, 'w') as output_file:
+            # redirect output to a temp file that is kept after closing
+            with tempfile.NamedTemporaryFile(delete=False, mode='wb', suffix='.log') as output_file:
                 process = subprocess.Popen(
-                    full_command,
-                    shell=True,
+                    argv or full_command,
+                    shell=argv is None,
                     cwd=work_dir,
                     stdout=output_file,
-                    stderr=output_file
+                    stderr=subprocess.STDOUT
                 )
 
             return {
                 "pid": process.pid,
                 "cwd": work_dir,
                 "command": full_command,
-                "output_file": temp_file_path
+                "output_file": output_file.name
             }
 
         except Exception as e:                    